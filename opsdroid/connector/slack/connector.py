@@ -1,24 +1,36 @@
 """A connector for Slack."""
+import asyncio
+import contextlib
+import hashlib
 import json
 import logging
 import os
 import re
-import ssl
+import time
+from collections import defaultdict
+from functools import lru_cache
 
 import aiohttp
-import certifi
+from appdirs import user_cache_dir
+from cachetools import TTLCache
 from emoji import demojize
 from slack_sdk.errors import SlackApiError
 from slack_sdk.socket_mode.aiohttp import SocketModeClient
 from slack_sdk.socket_mode.request import SocketModeRequest
 from slack_sdk.socket_mode.response import SocketModeResponse
 from slack_sdk.web.async_client import AsyncWebClient
-from voluptuous import Required
+from voluptuous import All, Range, Required
 
 import opsdroid.events
 from opsdroid.connector import Connector, register_event
 from opsdroid.connector.slack.create_events import SlackEventCreator
-from opsdroid.connector.slack.events import Blocks, EditedBlocks
+from opsdroid.connector.slack.events import Blocks, EditedBlocks, _get_ssl_context
+from opsdroid.const import NAME
+
+try:
+    import orjson as _json
+except ImportError:  # pragma: no cover
+    import json as _json
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,6 +40,13 @@ _USE_BOT_TOKEN_MSG = (
     "Please check Slack Connector docs for instructions on how to migrate. "
     "https://docs.opsdroid.dev/en/stable/connectors/slack.html"
 )
+_MENTION_RE = re.compile(r"<@([A-Z0-9]+)(?:\|[^>]+)?>")
+_IDENTITY_CACHE_DIR = user_cache_dir(NAME)
+_IDENTITY_CACHE_TTL = 24 * 60 * 60
+_API_CALL_RETRIES = 3
+_ACK_RESPONSE_BODY = b'"Received"'
+_COALESCE_DELAY = 0.05
+
 CONFIG_SCHEMA = {
     Required("bot-token", msg=_USE_BOT_TOKEN_MSG): str,
     "socket-mode": bool,
@@ -36,6 +55,34 @@ CONFIG_SCHEMA = {
     "default-room": str,
     "icon-emoji": str,
     "start_thread": bool,
+    "user-cache-size": All(int, Range(min=1)),
+    "user-cache-ttl": int,
+    "max-concurrent-api-calls": All(int, Range(min=1)),
+    "coalesce-messages": bool,
+}
+
+
+@lru_cache(maxsize=512)
+def _slack_name_for_emoji(emoji):
+    """Convert a unicode emoji to the name Slack uses for it."""
+    return demojize(emoji).replace(":", "")
+
+
+async def _read_form(request):
+    """Read the payload of an interactive action request."""
+    req = await request.post()
+
+    return _json.loads(req["payload"])
+
+
+async def _read_json(request):
+    """Read the payload of an Events API request."""
+    return await request.json(loads=_json.loads)
+
+
+_BODY_READERS = {
+    "application/x-www-form-urlencoded": _read_form,
+    "application/json": _read_json,
 }
 
 
@@ -54,7 +101,9 @@ class ConnectorSlack(Connector):
         self.start_thread = config.get("start_thread", False)
         self.socket_mode = config.get("socket-mode", True)
         self.app_token = config.get("app-token")
-        self.ssl_context = ssl.create_default_context(cafile=certifi.where())
+        self.coalesce_messages = config.get("coalesce-messages", False)
+        self._post_template = {"username": self.bot_name, "icon_emoji": self.icon_emoji}
+        self.ssl_context = _get_ssl_context()
         self.slack_web_client = AsyncWebClient(
             token=self.bot_token,
             ssl=self.ssl_context,
@@ -68,7 +117,17 @@ class ConnectorSlack(Connector):
         self.auth_info = None
         self.user_info = None
         self.bot_id = None
-        self.known_users = {}
+        self.known_users = TTLCache(
+            maxsize=config.get("user-cache-size", 10000),
+            ttl=config.get("user-cache-ttl", 3600),
+        )
+        self._pending_users = {}
+        self._api_semaphore = asyncio.Semaphore(
+            config.get("max-concurrent-api-calls", 16)
+        )
+        self._http_session = None
+        self._send_queue = defaultdict(list)
+        self._flush_tasks = {}
 
         self._event_creator = SlackEventCreator(self)
 
@@ -76,15 +135,31 @@ class ConnectorSlack(Connector):
         """Connect to the chat service."""
         _LOGGER.info(_("Connecting to Slack."))
 
+        # Share one pooled session between all Web API calls so keep-alive
+        # connections to slack.com get reused instead of re-handshaking.
+        if self._http_session is None or self._http_session.closed:
+            self._http_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    ssl=self.ssl_context,
+                    limit=64,
+                    limit_per_host=32,
+                    keepalive_timeout=75,
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.slack_web_client.timeout),
+            )
+        self.slack_web_client.session = self._http_session
+
         try:
-            self.auth_info = (await self.slack_web_client.api_call("auth.test")).data
-            self.user_info = (
-                await self.slack_web_client.api_call(
-                    "users.info",
-                    http_verb="GET",
-                    params={"user": self.auth_info["user_id"]},
-                )
-            ).data
+            if not self._load_cached_identity():
+                self.auth_info = (await self._api_call("auth.test")).data
+                self.user_info = (
+                    await self._api_call(
+                        "users.info",
+                        http_verb="GET",
+                        params={"user": self.auth_info["user_id"]},
+                    )
+                ).data
+                self._save_cached_identity()
             self.bot_id = self.user_info["user"]["profile"]["bot_id"]
         except SlackApiError as error:
             _LOGGER.error(
@@ -118,18 +193,118 @@ class ConnectorSlack(Connector):
             _LOGGER.debug(_("Using icon %s."), self.icon_emoji)
             _LOGGER.debug(_("Default room is %s."), self.default_target)
 
+    @property
+    def _identity_cache_path(self):
+        """Path of the file caching the bot identity for this token."""
+        key = hashlib.sha256(self.bot_token.encode()).hexdigest()[:16]
+
+        return os.path.join(_IDENTITY_CACHE_DIR, f"slack_identity_{key}.json")
+
+    def _load_cached_identity(self):
+        """Populate the bot identity from the disk cache.
+
+        The ``auth.test`` and ``users.info`` responses rarely change, so they
+        are reused for a day unless ``OPSDROID_SLACK_REFRESH_IDENTITY`` is set.
+
+        Return:
+            True if the identity was loaded from the cache, False otherwise.
+        """
+        if os.environ.get("OPSDROID_SLACK_REFRESH_IDENTITY") == "1":
+            return False
+
+        path = self._identity_cache_path
+        try:
+            if time.time() - os.path.getmtime(path) > _IDENTITY_CACHE_TTL:
+                return False
+            with open(path) as cache_file:
+                identity = json.load(cache_file)
+        except OSError:
+            return False
+        except ValueError:
+            identity = None
+
+        try:
+            auth_info = identity["auth_info"]
+            valid = (
+                isinstance(auth_info, dict)
+                and "user_id" in auth_info
+                and bool(identity["user_info"]["user"]["profile"]["bot_id"])
+            )
+        except (KeyError, TypeError):
+            valid = False
+
+        if not valid:
+            _LOGGER.warning(_("Ignoring invalid Slack bot identity cache %s."), path)
+            with contextlib.suppress(OSError):
+                os.remove(path)
+
+            return False
+
+        self.auth_info = identity["auth_info"]
+        self.user_info = identity["user_info"]
+        _LOGGER.debug(_("Using cached Slack bot identity from %s."), path)
+
+        return True
+
+    def _save_cached_identity(self):
+        """Write the bot identity to the disk cache."""
+        path = self._identity_cache_path
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as cache_file:
+                json.dump(
+                    {"auth_info": self.auth_info, "user_info": self.user_info},
+                    cache_file,
+                )
+        except OSError as error:
+            _LOGGER.warning(_("Unable to cache Slack bot identity: %s."), error)
+
     async def disconnect(self):
-        """Disconnect from Slack. Only needed when socket_mode_client is used
-        as the Events API uses the aiohttp server"""
+        """Disconnect from Slack.
+
+        Closes the socket_mode_client when used, as the Events API uses the
+        aiohttp server, sends any coalesced messages still queued and closes
+        the shared HTTP session for Web API calls.
+        """
 
         if self.socket_mode_client:
             await self.socket_mode_client.disconnect()
             await self.socket_mode_client.close()
 
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks.values(), return_exceptions=True)
+
+        if self._http_session:
+            await self._http_session.close()
+            self._http_session = None
+
+    async def _api_call(self, api_method, **kwargs):
+        """Call a Slack Web API method.
+
+        The number of requests in flight is capped by the
+        ``max-concurrent-api-calls`` option and rate limited (HTTP 429) calls
+        are retried after the delay requested by Slack.
+        """
+        for attempt in range(_API_CALL_RETRIES + 1):
+            try:
+                async with self._api_semaphore:
+                    return await self.slack_web_client.api_call(api_method, **kwargs)
+            except SlackApiError as error:
+                if error.response.status_code != 429 or attempt == _API_CALL_RETRIES:
+                    raise
+                delay = float(error.response.headers.get("Retry-After", 2 ** attempt))
+                _LOGGER.warning(
+                    _("Slack rate limited %s, retrying in %s seconds."),
+                    api_method,
+                    delay,
+                )
+                await asyncio.sleep(delay)
+
     async def listen(self):
         """Listen for and parse new messages."""
 
     async def event_handler(self, payload):
+        event = None
 
         if "type" in payload:
             if payload["type"] == "event_callback":
@@ -139,19 +314,23 @@ class ConnectorSlack(Connector):
 
                 if not event:
                     _LOGGER.info(
-                        f"Payload: {payload['type']} is not implemented. Event wont be parsed"
+                        _("Payload: %s is not implemented. Event wont be parsed"),
+                        payload["type"],
                     )
 
                     return
 
-        if isinstance(event, list):
-            for e in event:
-                _LOGGER.debug(f"Got slack event: {e}")
-                await self.opsdroid.parse(e)
+        if event is None:
+            return
+        elif isinstance(event, list):
+            await asyncio.gather(*(self._log_and_parse(e) for e in event))
+        elif isinstance(event, opsdroid.events.Event):
+            await self._log_and_parse(event)
 
-        if isinstance(event, opsdroid.events.Event):
-            _LOGGER.debug(f"Got slack event: {event}")
-            await self.opsdroid.parse(event)
+    async def _log_and_parse(self, event):
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(_("Got slack event: %s"), event)
+        await self.opsdroid.parse(event)
 
     async def socket_event_handler(
         self, client: SocketModeClient, req: SocketModeRequest
@@ -176,13 +355,8 @@ class ConnectorSlack(Connector):
             Failing to return a 200 OK may cause your webhook to be
             unsubscribed by the Messenger Platform.
         """
-        payload = {}
-
-        if request.content_type == "application/x-www-form-urlencoded":
-            req = await request.post()
-            payload = json.loads(req["payload"])
-        elif request.content_type == "application/json":
-            payload = await request.json()
+        reader = _BODY_READERS.get(request.content_type)
+        payload = await reader(request) if reader else {}
 
         if "type" in payload:
             if payload["type"] == "url_verification":
@@ -190,7 +364,9 @@ class ConnectorSlack(Connector):
             else:
                 await self.event_handler(payload)
 
-        return aiohttp.web.Response(text=json.dumps("Received"), status=200)
+        return aiohttp.web.Response(
+            body=_ACK_RESPONSE_BODY, status=200, content_type="application/json"
+        )
 
     async def search_history_messages(self, channel, start_time, end_time, limit=100):
         """
@@ -223,8 +399,15 @@ class ConnectorSlack(Connector):
                     await message.respond(messages)
         """
         messages = []
-        history = await self.slack_web_client.conversations_history(
-            channel=channel, oldest=start_time, latest=end_time, limit=limit
+        history = await self._api_call(
+            "conversations.history",
+            http_verb="GET",
+            params={
+                "channel": channel,
+                "oldest": start_time,
+                "latest": end_time,
+                "limit": limit,
+            },
         )
         cursor = history.get("response_metadata", {}).get("next_cursor")
 
@@ -237,8 +420,15 @@ class ConnectorSlack(Connector):
             messages += history["messages"]
 
             if cursor:
-                history = await self.slack_web_client.conversations_history(
-                    channel=channel, oldest=start_time, latest=end_time, cursor=cursor
+                history = await self._api_call(
+                    "conversations.history",
+                    http_verb="GET",
+                    params={
+                        "channel": channel,
+                        "oldest": start_time,
+                        "latest": end_time,
+                        "cursor": cursor,
+                    },
                 )
                 cursor = history.get("response_metadata", {}).get("next_cursor")
             else:
@@ -249,43 +439,61 @@ class ConnectorSlack(Connector):
         return messages
 
     async def lookup_username(self, userid):
-        """Lookup a username and cache it."""
+        """Lookup a username and cache it.
 
-        if userid in self.known_users:
-            user_info = self.known_users[userid]
-        else:
-            response = await self.slack_web_client.users_info(user=userid)
+        Concurrent lookups of the same user share a single ``users.info`` call.
+        """
+        user_info = self.known_users.get(userid)
+
+        if user_info is not None:
+            return user_info
+
+        if userid not in self._pending_users:
+            self._pending_users[userid] = asyncio.ensure_future(
+                self._fetch_user_info(userid)
+            )
+
+        return await asyncio.shield(self._pending_users[userid])
+
+    async def _fetch_user_info(self, userid):
+        """Request a user's profile from Slack and add it to the cache."""
+        try:
+            response = await self._api_call(
+                "users.info", http_verb="GET", params={"user": userid}
+            )
             user_info = response.data["user"]
 
             if isinstance(user_info, dict):
                 self.known_users[userid] = user_info
+        finally:
+            self._pending_users.pop(userid, None)
 
         return user_info
 
     async def replace_usernames(self, message):
         """Replace User ID with username in message text."""
-        userids = re.findall(r"\<\@([A-Z0-9]+)(?:\|.+)?\>", message)
-
-        for userid in userids:
-            user_info = await self.lookup_username(userid)
-            message = message.replace(
-                "<@{userid}>".format(userid=userid), user_info["name"]
-            )
+        userids = set(_MENTION_RE.findall(message))
+        users_info = await asyncio.gather(
+            *(self.lookup_username(userid) for userid in userids)
+        )
+        usernames = {
+            userid: user_info["name"]
+            for userid, user_info in zip(userids, users_info)
+            if isinstance(user_info, dict) and "name" in user_info
+        }
 
-        return message
+        return _MENTION_RE.sub(
+            lambda match: usernames.get(match.group(1), match.group(0)), message
+        )
 
     @register_event(opsdroid.events.Message)
     async def _send_message(self, message):
         """Respond with a message."""
-        _LOGGER.debug(
-            _("Responding with: '%s' in room  %s."), message.text, message.target
-        )
-        data = {
-            "channel": message.target,
-            "text": message.text,
-            "username": self.bot_name,
-            "icon_emoji": self.icon_emoji,
-        }
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                _("Responding with: '%s' in room  %s."), message.text, message.target
+            )
+        data = {**self._post_template, "channel": message.target, "text": message.text}
 
         if message.linked_event:
             raw_event = message.linked_event.raw_event
@@ -297,27 +505,86 @@ class ConnectorSlack(Connector):
             elif self.start_thread:
                 data["thread_ts"] = message.linked_event.event_id
 
-        return await self.slack_web_client.api_call(
+        if self.coalesce_messages:
+            return await self._queue_message(data)
+
+        return await self._api_call(
             "chat.postMessage",
             data=data,
         )
 
+    async def _queue_message(self, data):
+        """Queue a message so bursts to the same conversation are sent as one.
+
+        Messages sent to the same channel and thread within ``_COALESCE_DELAY``
+        seconds are joined with newlines into a single ``chat.postMessage``.
+        """
+        key = (data["channel"], data.get("thread_ts"))
+        sent = asyncio.get_running_loop().create_future()
+        self._send_queue[key].append((data["text"], sent))
+
+        if key not in self._flush_tasks:
+            flush_task = asyncio.ensure_future(
+                self._flush_after(key, data, _COALESCE_DELAY)
+            )
+            flush_task.add_done_callback(
+                lambda task: self._drop_unsent_messages(key, task)
+            )
+            self._flush_tasks[key] = flush_task
+
+        return await sent
+
+    def _drop_unsent_messages(self, key, flush_task):
+        """Cancel a queued batch whose flush task ended before detaching it."""
+        if self._flush_tasks.get(key) is not flush_task:
+            return
+
+        del self._flush_tasks[key]
+
+        for _text, sent in self._send_queue.pop(key, []):
+            if not sent.done():
+                sent.cancel()
+
+    async def _flush_after(self, key, data, delay):
+        """Send the messages queued for a conversation after a delay."""
+        queued = []
+
+        try:
+            await asyncio.sleep(delay)
+            del self._flush_tasks[key]
+            queued = self._send_queue.pop(key)
+            data = {**data, "text": "\n".join(text for text, _sent in queued)}
+            response = await self._api_call("chat.postMessage", data=data)
+        except Exception as error:  # pylint: disable=broad-except
+            for _text, sent in queued:
+                if not sent.done():
+                    sent.set_exception(error)
+        else:
+            for _text, sent in queued:
+                if not sent.done():
+                    sent.set_result(response)
+        finally:
+            for _text, sent in queued:
+                if not sent.done():
+                    sent.cancel()
+
     @register_event(opsdroid.events.EditedMessage)
     async def _edit_message(self, message):
         """Edit a message."""
-        _LOGGER.debug(
-            _("Editing message with timestamp: '%s' to %s in room  %s."),
-            message.linked_event,
-            message.text,
-            message.target,
-        )
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                _("Editing message with timestamp: '%s' to %s in room  %s."),
+                message.linked_event,
+                message.text,
+                message.target,
+            )
         data = {
             "channel": message.target,
             "ts": message.linked_event,
             "text": message.text,
         }
 
-        return await self.slack_web_client.api_call(
+        return await self._api_call(
             "chat.update",
             data=data,
         )
@@ -325,35 +592,36 @@ class ConnectorSlack(Connector):
     @register_event(Blocks)
     async def _send_blocks(self, blocks):
         """Respond with structured blocks."""
-        _LOGGER.debug(
-            _("Responding with interactive blocks in room %s."), blocks.target
-        )
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                _("Responding with interactive blocks in room %s."), blocks.target
+            )
 
-        return await self.slack_web_client.api_call(
+        return await self._api_call(
             "chat.postMessage",
             data={
+                **self._post_template,
                 "channel": blocks.target,
-                "username": self.bot_name,
                 "blocks": blocks.blocks,
-                "icon_emoji": self.icon_emoji,
             },
         )
 
     @register_event(EditedBlocks)
     async def _edit_blocks(self, blocks):
         """Edit a particular block."""
-        _LOGGER.debug(
-            _("Editing interactive blocks with timestamp: '%s' in room  %s."),
-            blocks.linked_event,
-            blocks.target,
-        )
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                _("Editing interactive blocks with timestamp: '%s' in room  %s."),
+                blocks.linked_event,
+                blocks.target,
+            )
         data = {
             "channel": blocks.target,
             "ts": blocks.linked_event,
             "blocks": blocks.blocks,
         }
 
-        return await self.slack_web_client.api_call(
+        return await self._api_call(
             "chat.update",
             data=data,
         )
@@ -361,10 +629,11 @@ class ConnectorSlack(Connector):
     @register_event(opsdroid.events.Reaction)
     async def send_reaction(self, reaction):
         """React to a message."""
-        emoji = demojize(reaction.emoji).replace(":", "")
-        _LOGGER.debug(_("Reacting with: %s."), emoji)
+        emoji = _slack_name_for_emoji(reaction.emoji)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(_("Reacting with: %s."), emoji)
         try:
-            return await self.slack_web_client.api_call(
+            return await self._api_call(
                 "reactions.add",
                 data={
                     "name": emoji,
@@ -380,50 +649,55 @@ class ConnectorSlack(Connector):
 
     @register_event(opsdroid.events.NewRoom)
     async def _send_room_creation(self, creation_event):
-        _LOGGER.debug(_("Creating room %s."), creation_event.name)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(_("Creating room %s."), creation_event.name)
 
-        return await self.slack_web_client.api_call(
+        return await self._api_call(
             "conversations.create", data={"name": creation_event.name}
         )
 
     @register_event(opsdroid.events.RoomName)
     async def _send_room_name_set(self, name_event):
-        _LOGGER.debug(
-            _("Renaming room %s to '%s'."), name_event.target, name_event.name
-        )
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                _("Renaming room %s to '%s'."), name_event.target, name_event.name
+            )
 
-        return await self.slack_web_client.api_call(
+        return await self._api_call(
             "conversations.rename",
             data={"channel": name_event.target, "name": name_event.name},
         )
 
     @register_event(opsdroid.events.JoinRoom)
     async def _send_join_room(self, join_event):
-        return await self.slack_web_client.api_call(
+        return await self._api_call(
             "conversations.join", data={"channel": join_event.target}
         )
 
     @register_event(opsdroid.events.UserInvite)
     async def _send_user_invitation(self, invite_event):
-        _LOGGER.debug(
-            _("Inviting user %s to room '%s'."), invite_event.user, invite_event.target
-        )
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                _("Inviting user %s to room '%s'."),
+                invite_event.user,
+                invite_event.target,
+            )
 
-        return await self.slack_web_client.api_call(
+        return await self._api_call(
             "conversations.invite",
             data={"channel": invite_event.target, "users": invite_event.user_id},
         )
 
     @register_event(opsdroid.events.RoomDescription)
     async def _send_room_description(self, desc_event):
-        return await self.slack_web_client.api_call(
+        return await self._api_call(
             "conversations.setTopic",
             data={"channel": desc_event.target, "topic": desc_event.description},
         )
 
     @register_event(opsdroid.events.PinMessage)
     async def _send_pin_message(self, pin_event):
-        return await self.slack_web_client.api_call(
+        return await self._api_call(
             "pins.add",
             data={
                 "channel": pin_event.target,
@@ -433,7 +707,7 @@ class ConnectorSlack(Connector):
 
     @register_event(opsdroid.events.UnpinMessage)
     async def _send_unpin_message(self, unpin_event):
-        return await self.slack_web_client.api_call(
+        return await self._api_call(
             "pins.remove",
             data={
                 "channel": unpin_event.target,
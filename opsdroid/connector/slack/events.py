@@ -11,6 +11,18 @@ from opsdroid import events
 
 _LOGGER = logging.getLogger(__name__)
 
+_SSL_CONTEXT = None
+
+
+def _get_ssl_context():
+    """Return the SSL context trusting certifi's CA bundle, creating it once."""
+    global _SSL_CONTEXT
+
+    if _SSL_CONTEXT is None:
+        _SSL_CONTEXT = ssl.create_default_context(cafile=certifi.where())
+
+    return _SSL_CONTEXT
+
 
 class Blocks(events.Message):
     """A blocks object.
@@ -48,7 +60,7 @@ class Blocks(events.Message):
 
         self.blocks = blocks
 
-        if isinstance(self.blocks, list):
+        if isinstance(self.blocks, (list, dict)):
             self.blocks = json.dumps(self.blocks)
 
 
@@ -67,7 +79,7 @@ class InteractiveAction(events.Event):
         """Create object with minimum properties."""
         super().__init__(*args, **kwargs)
         self.payload = payload
-        self.ssl_context = ssl.create_default_context(cafile=certifi.where())
+        self.ssl_context = _get_ssl_context()
 
     async def respond(self, response_event):
         """Respond to this message using the response_url field in the payload."""
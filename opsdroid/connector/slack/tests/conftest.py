@@ -10,6 +10,18 @@ def get_path(file_name: str) -> str:
     return Path(__file__).parent / "responses" / file_name
 
 
+@pytest.fixture(autouse=True)
+def identity_cache_dir(tmp_path, monkeypatch):
+    """Keep the bot identity cache out of the user's cache directory."""
+
+    monkeypatch.setattr(
+        "opsdroid.connector.slack.connector._IDENTITY_CACHE_DIR", str(tmp_path)
+    )
+    monkeypatch.delenv("OPSDROID_SLACK_REFRESH_IDENTITY", raising=False)
+
+    return tmp_path
+
+
 @pytest.fixture
 async def connector(opsdroid, mock_api_obj):
     """Initiate a basic connector setup for testing on."""
@@ -22,3 +34,18 @@ async def connector(opsdroid, mock_api_obj):
     slack_connector.slack_web_client.base_url = mock_api_obj.base_url
 
     yield slack_connector
+
+
+@pytest.fixture
+def connected_connector(connector):
+    """Connector with the bot identity that ``connect()`` would fetch from Slack.
+
+    Use it in tests that need a connected bot but do not exercise ``connect()``
+    itself, to skip the ``auth.test`` and ``users.info`` round trips.
+    """
+
+    connector.auth_info = {"ok": True, "user_id": "B061F7JD2"}
+    connector.user_info = {"ok": True, "user": {"profile": {"bot_id": "B061F7JD2"}}}
+    connector.bot_id = "B061F7JD2"
+
+    return connector
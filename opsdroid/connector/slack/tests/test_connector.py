@@ -1,12 +1,16 @@
 """Tests for the ConnectorSlack class."""
+import asyncio
+import json
 import logging
+import os
 
 import asynctest.mock as amock
 import pytest
 from slack_sdk.socket_mode.request import SocketModeRequest
 
 from opsdroid import events
-from opsdroid.connector.slack.connector import SlackApiError
+from opsdroid.configuration.validation import validate_configuration
+from opsdroid.connector.slack.connector import CONFIG_SCHEMA, SlackApiError
 from opsdroid.connector.slack.events import Blocks, EditedBlocks
 
 from .conftest import get_path
@@ -32,12 +36,12 @@ PINS_REMOVE = ("/pins.remove", "POST", {"ok": True}, 200)
 
 
 @pytest.fixture
-async def send_event(connector, mock_api):
+async def send_event(connected_connector, mock_api):
     """Mock a send opsdroid event and return payload used and response from the request"""
 
     async def _send_event(api_call, event):
         api_endpoint, *_ = api_call
-        response = await connector.send(event)
+        response = await connected_connector.send(event)
         payload = mock_api.get_payload(api_endpoint)
 
         return payload, response
@@ -55,6 +59,65 @@ async def test_connect_events_api(connector, mock_api):
     connector.auth_info["user_id"] == "B061F7JD2"
     connector.user_info["user"] = "B061F7JD2"
     assert connector.bot_id == "B061F7JD2"
+    assert connector.slack_web_client.session is connector._http_session
+    assert connector._http_session.timeout.total == connector.slack_web_client.timeout
+    await connector.disconnect()
+    assert connector._http_session is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.add_response(*USERS_INFO)
+@pytest.mark.add_response(*AUTH_TEST)
+async def test_connect_uses_cached_identity(connected_connector, mock_api):
+    connector = connected_connector
+    connector._save_cached_identity()
+    connector.auth_info = connector.user_info = connector.bot_id = None
+
+    await connector.connect()
+    assert not mock_api.called("/auth.test")
+    assert not mock_api.called("/users.info")
+    assert connector.bot_id == "B061F7JD2"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "cached_identity",
+    [
+        "not json",
+        "null",
+        "[]",
+        '{"auth_info": {"user_id": "B061F7JD2"}, "user_info": {"user": {}}}',
+    ],
+)
+@pytest.mark.add_response(*USERS_INFO)
+@pytest.mark.add_response(*AUTH_TEST)
+async def test_connect_invalid_cached_identity(connector, mock_api, cached_identity):
+    path = connector._identity_cache_path
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as cache_file:
+        cache_file.write(cached_identity)
+
+    await connector.connect()
+    assert mock_api.called("/auth.test")
+    assert mock_api.called("/users.info")
+    assert connector.bot_id == "B061F7JD2"
+    with open(path) as cache_file:
+        assert json.load(cache_file)["user_info"]["user"]["profile"]["bot_id"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.add_response(*USERS_INFO)
+@pytest.mark.add_response(*AUTH_TEST)
+async def test_connect_refresh_cached_identity(connector, mock_api, monkeypatch):
+    connector.auth_info = {"user_id": "B061F7JD2"}
+    connector.user_info = {"user": {"profile": {"bot_id": "OLD"}}}
+    connector._save_cached_identity()
+    monkeypatch.setenv("OPSDROID_SLACK_REFRESH_IDENTITY", "1")
+
+    await connector.connect()
+    assert mock_api.called("/auth.test")
+    assert mock_api.called("/users.info")
+    assert connector.bot_id == "B061F7JD2"
 
 
 @pytest.mark.asyncio
@@ -121,6 +184,34 @@ async def test_socket_event_handler(opsdroid, mock_api_obj, mock_api):
     assert connector.socket_mode_client.send_socket_mode_response.called
 
 
+@pytest.mark.asyncio
+async def test_event_handler_list_of_events(connector):
+    first = events.Message(text="first", connector=connector)
+    second = events.Message(text="second", connector=connector)
+    connector._event_creator.create_event = amock.CoroutineMock(
+        return_value=[first, second]
+    )
+    connector.opsdroid.parse = amock.CoroutineMock()
+
+    await connector.event_handler({"type": "event_callback", "event": {}})
+
+    assert connector.opsdroid.parse.call_count == 2
+    connector.opsdroid.parse.assert_any_call(first)
+    connector.opsdroid.parse.assert_any_call(second)
+
+
+@pytest.mark.asyncio
+async def test_event_handler_no_event(connector):
+    connector._event_creator.create_event = amock.CoroutineMock(return_value=None)
+    connector.opsdroid.parse = amock.CoroutineMock()
+
+    await connector.event_handler({"type": "event_callback", "event": {}})
+    await connector.event_handler({})
+
+    assert connector._event_creator.create_event.call_count == 1
+    assert not connector.opsdroid.parse.called
+
+
 @pytest.mark.asyncio
 @pytest.mark.add_response(
     "/users.info",
@@ -134,6 +225,67 @@ async def test_lookup_username_user_not_present(connector, mock_api):
     assert user["id"] == "U01NK1K9L68"
 
 
+@pytest.mark.asyncio
+@pytest.mark.add_response(
+    "/users.info",
+    "GET",
+    {"ok": True, "user": {"id": "U01NK1K9L68", "name": "Test User"}},
+    200,
+)
+async def test_lookup_username_concurrent_calls(connector, mock_api):
+    users = await asyncio.gather(
+        connector.lookup_username("U01NK1K9L68"),
+        connector.lookup_username("U01NK1K9L68"),
+    )
+    assert mock_api.call_count("/users.info") == 1
+    assert users[0] == users[1] == {"id": "U01NK1K9L68", "name": "Test User"}
+    assert not connector._pending_users
+
+
+@pytest.mark.asyncio
+@pytest.mark.add_response(
+    "/users.info",
+    "GET",
+    {"ok": True, "user": {"id": "U01NK1K9L68", "name": "Test User"}},
+    200,
+)
+async def test_lookup_username_cancelled_caller(connector, mock_api):
+    cancelled = asyncio.ensure_future(connector.lookup_username("U01NK1K9L68"))
+    waiting = asyncio.ensure_future(connector.lookup_username("U01NK1K9L68"))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+
+    assert await waiting == {"id": "U01NK1K9L68", "name": "Test User"}
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+    assert mock_api.call_count("/users.info") == 1
+
+
+@pytest.mark.asyncio
+async def test_known_users_cache_config(opsdroid):
+    opsdroid.config["connectors"] = {
+        "slack": {"bot-token": "abc123", "user-cache-size": 2, "user-cache-ttl": 60}
+    }
+    await opsdroid.load()
+    connector = opsdroid.get_connector("slack")
+    assert connector.known_users.maxsize == 2
+    assert connector.known_users.ttl == 60
+
+
+def test_max_concurrent_api_calls_must_be_positive():
+    with pytest.raises(SystemExit):
+        validate_configuration(
+            {"bot-token": "abc123", "max-concurrent-api-calls": 0}, CONFIG_SCHEMA
+        )
+
+
+def test_known_users_cache_size_must_be_positive():
+    with pytest.raises(SystemExit):
+        validate_configuration(
+            {"bot-token": "abc123", "user-cache-size": 0}, CONFIG_SCHEMA
+        )
+
+
 @pytest.mark.asyncio
 @pytest.mark.add_response(*CONVERSATIONS_HISTORY)
 async def test_search_history_messages(connector, mock_api):
@@ -188,6 +340,17 @@ async def test_replace_usernames(connector):
     assert replaced_message == "hello Test User"
 
 
+@pytest.mark.asyncio
+async def test_replace_usernames_repeated_mentions(connector):
+    connector.known_users = {
+        "U01NK1K9L68": {"name": "Test User"},
+        "U01NK1K9L69": {"id": "U01NK1K9L69"},
+    }
+    message = "<@U01NK1K9L68> <@U01NK1K9L69> <@U01NK1K9L68|test.user>"
+    replaced_message = await connector.replace_usernames(message)
+    assert replaced_message == "Test User <@U01NK1K9L69> Test User"
+
+
 @pytest.mark.asyncio
 @pytest.mark.add_response(*CHAT_POST_MESSAGE)
 async def test_send_message(send_event, connector):
@@ -252,6 +415,90 @@ async def test_send_message_inside_thread_is_true(connector, send_event):
     assert response["ok"]
 
 
+@pytest.mark.asyncio
+@pytest.mark.add_response(*CHAT_POST_MESSAGE)
+@pytest.mark.add_response(
+    "/chat.postMessage", "POST", {"ok": False, "error": "ratelimited"}, 429
+)
+async def test_send_message_rate_limited(send_event, connector, mock_api, monkeypatch):
+    delays = []
+    sleep = asyncio.sleep
+
+    async def no_sleep(delay, *args, **kwargs):
+        delays.append(delay)
+        await sleep(0)
+
+    monkeypatch.setattr(asyncio, "sleep", no_sleep)
+    event = events.Message(text="test", user="user", target="room", connector=connector)
+    _, response = await send_event(CHAT_POST_MESSAGE, event)
+    assert mock_api.call_count("/chat.postMessage") == 2
+    assert 1.0 in delays
+    assert response["ok"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.add_response(
+    "/chat.postMessage", "POST", {"ok": False, "error": "channel_not_found"}, 200
+)
+async def test_send_message_api_error_not_retried(send_event, connector, mock_api):
+    event = events.Message(text="test", user="user", target="room", connector=connector)
+    with pytest.raises(SlackApiError):
+        await send_event(CHAT_POST_MESSAGE, event)
+    assert mock_api.call_count("/chat.postMessage") == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.add_response(*CHAT_POST_MESSAGE)
+async def test_send_message_coalesced(connector, mock_api):
+    connector.coalesce_messages = True
+    responses = await asyncio.gather(
+        connector.send(events.Message(text="one", target="room", connector=connector)),
+        connector.send(events.Message(text="two", target="room", connector=connector)),
+    )
+    assert mock_api.call_count("/chat.postMessage") == 1
+    assert mock_api.get_payload("/chat.postMessage") == {
+        "channel": "room",
+        "text": "one\ntwo",
+        "username": "opsdroid",
+        "icon_emoji": ":robot_face:",
+    }
+    assert all(response["ok"] for response in responses)
+    assert not connector._flush_tasks
+
+
+@pytest.mark.asyncio
+async def test_send_message_coalesced_flush_cancelled(connector):
+    connector.coalesce_messages = True
+    sending = asyncio.ensure_future(
+        connector.send(events.Message(text="one", target="room", connector=connector))
+    )
+    while not connector._flush_tasks:
+        await asyncio.sleep(0)
+    for task in list(connector._flush_tasks.values()):
+        task.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await sending
+    assert not connector._flush_tasks
+    assert not connector._send_queue
+
+
+@pytest.mark.asyncio
+@pytest.mark.add_response(*CHAT_POST_MESSAGE)
+async def test_disconnect_flushes_coalesced_messages(connector, mock_api):
+    connector.coalesce_messages = True
+    sending = asyncio.ensure_future(
+        connector.send(events.Message(text="one", target="room", connector=connector))
+    )
+    while not connector._flush_tasks:
+        await asyncio.sleep(0)
+    await connector.disconnect()
+
+    assert mock_api.called("/chat.postMessage")
+    assert (await sending)["ok"]
+    assert not connector._flush_tasks
+
+
 @pytest.mark.asyncio
 @pytest.mark.add_response(*CHAT_UPDATE_MESSAGE)
 async def test_edit_message(send_event, connector):
@@ -1,11 +1,25 @@
 """Test events from Slack"""
+import json
 
 import pytest
-from opsdroid.connector.slack.events import InteractiveAction
+from opsdroid.connector.slack.events import Blocks, InteractiveAction
 from opsdroid.events import Message
 from opsdroid.testing import MINIMAL_CONFIG, running_opsdroid
 
 
+@pytest.mark.parametrize("blocks", [[{"type": "divider"}], {"type": "divider"}])
+def test_blocks_serialized_once(blocks):
+    event = Blocks(blocks)
+    assert isinstance(event.blocks, str)
+    assert json.loads(event.blocks) == blocks
+
+
+def test_blocks_string_not_reencoded():
+    blocks = '[{"type": "divider"}]'
+    event = Blocks(blocks)
+    assert event.blocks is blocks
+
+
 @pytest.mark.asyncio
 @pytest.mark.add_response("/", "POST", {"ok": True}, 200)
 async def test_respond_response_url_exists(mock_api_obj, mock_api):